@@ -1,14 +1,44 @@
 import streamlit as st
 import os
+import hashlib
 from dotenv import load_dotenv
 from crawler import WebsiteCrawler
 from text_processor import TextProcessor
 from vector_store import VectorStoreManager
-from qa_engine import QAEngine
+from qa_engine import QAEngine, SemanticAnswerCache
 
 # Load environment variables
 load_dotenv()
 
+@st.cache_resource
+def get_crawler() -> WebsiteCrawler:
+    """Share one crawler (and its pooled HTTP session) across reruns."""
+    return WebsiteCrawler()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def crawl_page(url: str):
+    """Crawl a URL, reusing the result for an hour."""
+    return get_crawler().crawl(url)
+
+@st.cache_data(show_spinner=False)
+def chunk_page(content: dict, url: str):
+    """Split crawled content into chunks, reusing the result for identical content."""
+    return TextProcessor().process_and_chunk(content, url)
+
+# Re-indexing a URL replaces its collection, so only the latest store is kept
+@st.cache_resource(max_entries=1, show_spinner=False)
+def build_store(chunks_key: str, _chunks):
+    """Embed and store chunks; _chunks is not hashed, chunks_key identifies them."""
+    return VectorStoreManager().create_store(_chunks)
+
+def get_chunks_key(chunks) -> str:
+    """Stable hash of the chunk texts, independent of their order."""
+    digest = hashlib.sha256()
+    for text in sorted(chunk.page_content for chunk in chunks):
+        digest.update(text.encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
 # Initialize session state
 if 'vector_store' not in st.session_state:
     st.session_state.vector_store = None
@@ -16,6 +46,8 @@ if 'chat_history' not in st.session_state:
     st.session_state.chat_history = []
 if 'url_indexed' not in st.session_state:
     st.session_state.url_indexed = False
+if 'answer_cache' not in st.session_state:
+    st.session_state.answer_cache = SemanticAnswerCache()
 
 st.title("Website Chatbot with AI Embeddings")
 st.markdown("Enter a website URL, index its content, and ask questions about it!")
@@ -31,24 +63,22 @@ if st.button("Index Website"):
         with st.spinner("Crawling and indexing website..."):
             try:
                 # Crawl website
-                crawler = WebsiteCrawler()
-                content = crawler.crawl(url)
+                content = crawl_page(url)
 
                 if not content:
                     st.error("No content could be extracted from the website")
                     st.stop()
 
                 # Process text
-                processor = TextProcessor()
-                chunks = processor.process_and_chunk(content, url)
+                chunks = chunk_page(content, url)
 
                 if not chunks:
                     st.error("No meaningful content chunks could be created")
                     st.stop()
 
                 # Create embeddings and store
-                vector_manager = VectorStoreManager()
-                st.session_state.vector_store = vector_manager.create_store(chunks)
+                st.session_state.vector_store = build_store(get_chunks_key(chunks), chunks)
+                st.session_state.answer_cache = SemanticAnswerCache()
 
                 st.session_state.url_indexed = True
                 st.success(f"Successfully indexed website! Created {len(chunks)} content chunks.")
@@ -77,7 +107,7 @@ if st.session_state.url_indexed:
         with st.chat_message("assistant"):
             with st.spinner("Thinking..."):
                 try:
-                    qa_engine = QAEngine(st.session_state.vector_store)
+                    qa_engine = QAEngine(st.session_state.vector_store, st.session_state.answer_cache)
                     response = qa_engine.ask_question(prompt, st.session_state.chat_history)
 
                     st.write(response)
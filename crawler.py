@@ -1,15 +1,167 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 from urllib.parse import urljoin, urlparse
 import re
-from typing import List, Dict, Optional
+import codecs
+from typing import List, Dict, Optional, Tuple, Iterator
 
-class WebsiteCrawler:
+# Prefer the C-based lxml parser; fall back to the stdlib parser if it isn't installed
+try:
+    from lxml import etree
+    HTML_PARSER = 'lxml'
+except ImportError:
+    etree = None
+    HTML_PARSER = 'html.parser'
+
+# Only build the parts of the tree that can contribute text; everything in <head>
+# except the title (meta, link, script, style) is dropped at parse time
+CONTENT_STRAINER = SoupStrainer([
+    'main', 'article', 'section', 'p', 'h1', 'h2', 'h3', 'h4',
+    'li', 'td', 'span', 'div', 'body', 'title'
+])
+
+# Shared session so keep-alive connections are reused across crawls
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(total=2, backoff_factor=0.3)
+)
+_SESSION.mount('http://', _ADAPTER)
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': 'gzip, deflate'
+})
+
+# Characters kept by _clean_text: word characters, whitespace and basic punctuation.
+# ASCII text is filtered with a translate table; the regex handles the rest.
+_PUNCT_RE = re.compile(r'[^\w\s.,!?-]')
+_ASCII_PUNCT_TABLE = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128)
+    if not (chr(c).isalnum() or chr(c).isspace() or chr(c) in '_.,!?-')
+))
+
+# Tags and classes whose text never reaches the extracted content
+SKIP_TAGS = frozenset({'header', 'footer', 'nav', 'aside', 'script', 'style', 'noscript'})
+SKIP_CLASSES = frozenset({
+    'header', 'footer', 'navigation', 'nav', 'sidebar', 'advertisement', 'ads', 'ad',
+    'menu', 'navbar', 'footer-links', 'social-share', 'share-buttons',
+    'cookie-banner', 'popup', 'modal'
+})
+
+# The same elements as a single CSS selector list for the BeautifulSoup fallback
+UNWANTED_SELECTOR = ', '.join(sorted(SKIP_TAGS) + sorted('.' + cls for cls in SKIP_CLASSES))
+
+# Selectors that mark the main content area of a page, in order of preference
+MAIN_SELECTORS = (
+    'main', 'article', '.main-content', '.content',
+    '.post-content', '.entry-content', '#main',
+    '#content', '.article-body', '.post-body'
+)
+
+# Number of leading bytes inspected to pick a page's encoding
+ENCODING_SNIFF_BYTES = 4096
+_META_CHARSET_RE = re.compile(rb'<meta[^>]*?charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+class ContentTarget:
+    """
+    lxml parser target that collects page text from parser events without
+    ever building a document tree.
+    """
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self.title_parts = []
+        self.body_parts = []
+        self.regions = {}  # Text of the first element matching each main selector
+        self.open_regions = {}  # Selector -> depth of its still-open element
+        self.skip_depth = 0
+        self.depth = 0
+        self.in_title = False
+
+    def start(self, tag, attrib):
+        classes = attrib.get('class', '').split()
+
+        if self.skip_depth or tag in SKIP_TAGS or SKIP_CLASSES.intersection(classes):
+            self.skip_depth += 1
+            return
+
+        self.depth += 1
+
+        # Like select_one(), only the first element matching a selector counts
+        keys = {tag, '#' + attrib.get('id', '')}
+        keys.update('.' + cls for cls in classes)
+        for selector in MAIN_SELECTORS:
+            if selector in keys and selector not in self.regions:
+                self.regions[selector] = []
+                self.open_regions[selector] = self.depth
+
+        if tag == 'title':
+            self.in_title = True
+
+        self._separate()
+
+    def end(self, tag):
+        if self.skip_depth:
+            self.skip_depth -= 1
+            return
+
+        if tag == 'title':
+            self.in_title = False
+
+        self._separate()
+
+        if self.open_regions:
+            for selector, depth in list(self.open_regions.items()):
+                if depth == self.depth:
+                    del self.open_regions[selector]
+        self.depth -= 1
+
+    def data(self, data):
+        if self.skip_depth:
+            return
+
+        if self.in_title:
+            self.title_parts.append(data)
+            return
+
+        self.body_parts.append(data)
+        for selector in self.open_regions:
+            self.regions[selector].append(data)
+
+    def close(self):
+        """
+        Return the collected (title, text). The text is that of the main content
+        area matched by the most preferred selector, or of the whole body.
+        """
+        title = ''.join(self.title_parts).strip() or "Untitled Page"
+        for selector in MAIN_SELECTORS:
+            if selector in self.regions:
+                text = ''.join(self.regions[selector])
+                if text.strip():
+                    return title, text
+                break
+        return title, ''.join(self.body_parts)
+
+    def _separate(self):
+        # Text nodes may be split across feed() calls, so words are only
+        # separated at element boundaries
+        self.body_parts.append(' ')
+        for selector in self.open_regions:
+            self.regions[selector].append(' ')
+
+class WebsiteCrawler:
+    def __init__(self, max_bytes: int = 10_000_000):
+        """
+        Initialize the crawler.
+
+        Args:
+            max_bytes: Maximum number of bytes read from a page; anything beyond
+                this is dropped so oversized responses can't exhaust memory
+        """
+        self.session = _SESSION
+        self.max_bytes = max_bytes
 
     def crawl(self, url: str) -> Optional[Dict[str, str]]:
         """
@@ -26,18 +178,27 @@ class WebsiteCrawler:
             if not self._is_valid_url(url):
                 raise ValueError("Invalid URL format")
 
-            # Make request
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+            # Make request; the context manager releases the connection even
+            # if raise_for_status() fails before the body is read
+            with self.session.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
 
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+                if etree is not None:
+                    # Stream the body through lxml without building a tree
+                    title, content = self._extract_streaming(response)
+                else:
+                    # Parse HTML
+                    body = b''.join(self._iter_body(response))
+                    soup = BeautifulSoup(
+                        body, HTML_PARSER, parse_only=CONTENT_STRAINER,
+                        from_encoding=self._detect_encoding(response, body)
+                    )
 
-            # Extract title
-            title = self._extract_title(soup)
+                    # Extract title
+                    title = self._extract_title(soup)
 
-            # Extract main content
-            content = self._extract_content(soup, url)
+                    # Extract main content
+                    content = self._extract_content(soup, url)
 
             if not content.strip():
                 return None
@@ -53,6 +214,24 @@ class WebsiteCrawler:
         except Exception as e:
             raise Exception(f"Error crawling website: {str(e)}")
 
+    def _iter_body(self, response: requests.Response) -> Iterator[bytes]:
+        """
+        Yield the response body in chunks, stopping once max_bytes have been read.
+        """
+        remaining = self.max_bytes
+        try:
+            for chunk in response.iter_content(65536):
+                if not chunk:
+                    continue
+                if len(chunk) >= remaining:
+                    yield chunk[:remaining]
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            # Release the connection even if the rest of the body was never read
+            response.close()
+
     def _is_valid_url(self, url: str) -> bool:
         """Check if URL is valid."""
         try:
@@ -68,6 +247,66 @@ class WebsiteCrawler:
             return title_tag.get_text().strip()
         return "Untitled Page"
 
+    def _extract_streaming(self, response: requests.Response) -> Tuple[str, str]:
+        """
+        Feed the response body to lxml chunk by chunk and collect title and text.
+        """
+        chunks = self._iter_body(response)
+
+        # Buffer enough of the page to pick its encoding before parsing starts
+        head = b''
+        for chunk in chunks:
+            head += chunk
+            if len(head) >= ENCODING_SNIFF_BYTES:
+                break
+
+        # lxml refuses to close a parser that never saw any input
+        if not head:
+            return "Untitled Page", ""
+
+        parser = etree.HTMLParser(target=ContentTarget(), encoding=self._detect_encoding(response, head))
+        parser.feed(head)
+        for chunk in chunks:
+            parser.feed(chunk)
+
+        title, text = parser.close()
+
+        return title, self._clean_text(text)
+
+    def _detect_encoding(self, response: requests.Response, head: bytes) -> str:
+        """
+        Pick the encoding of a page from its first bytes, so that the streaming
+        and BeautifulSoup paths decode it the same way.
+
+        The charset sent by the server wins, then a <meta> charset. Without
+        either, the page is taken as UTF-8 if its first bytes are valid UTF-8
+        and as windows-1252 otherwise.
+        """
+        head = head[:ENCODING_SNIFF_BYTES]
+
+        # requests reports ISO-8859-1 for any text/* response, so only trust
+        # its encoding if the server actually sent a charset
+        declared = []
+        if 'charset' in response.headers.get('Content-Type', '').lower():
+            declared.append(response.encoding)
+        match = _META_CHARSET_RE.search(head)
+        if match:
+            declared.append(match.group(1).decode('ascii'))
+
+        for encoding in declared:
+            try:
+                codecs.lookup(encoding)
+                return encoding
+            except LookupError:
+                continue
+
+        try:
+            # Incremental, so a character cut off at the end of head is not an error
+            codecs.getincrementaldecoder('utf-8')().decode(head)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'windows-1252'
+
     def _extract_content(self, soup: BeautifulSoup, base_url: str) -> str:
         """
         Extract meaningful content from the webpage, removing irrelevant sections.
@@ -100,35 +339,16 @@ class WebsiteCrawler:
 
     def _remove_unwanted_elements(self, soup: BeautifulSoup):
         """Remove headers, footers, navigation, ads, etc."""
-        # Common selectors for unwanted content
-        unwanted_selectors = [
-            'header', 'footer', 'nav', 'aside',
-            '.header', '.footer', '.navigation', '.nav',
-            '.sidebar', '.advertisement', '.ads', '.ad',
-            '.menu', '.navbar', '.footer-links',
-            'script', 'style', 'noscript',
-            '.social-share', '.share-buttons',
-            '.cookie-banner', '.popup', '.modal'
-        ]
-
-        for selector in unwanted_selectors:
-            for element in soup.select(selector):
-                element.decompose()
-
-        # Remove comments
-        for comment in soup.find_all(text=lambda text: isinstance(text, str) and text.strip().startswith('<!--')):
-            comment.extract()
+        # The strainer only filters top-level tags, so anything nested inside
+        # <body> still has to be removed here. All selectors are matched in a
+        # single walk over the tree. Comments need no pass of their own since
+        # get_text() skips them.
+        for element in soup.select(UNWANTED_SELECTOR):
+            element.decompose()
 
     def _find_main_content(self, soup: BeautifulSoup) -> Optional[BeautifulSoup]:
         """Try to find the main content area."""
-        # Common main content selectors
-        main_selectors = [
-            'main', 'article', '.main-content', '.content',
-            '.post-content', '.entry-content', '#main',
-            '#content', '.article-body', '.post-body'
-        ]
-
-        for selector in main_selectors:
+        for selector in MAIN_SELECTORS:
             main_content = soup.select_one(selector)
             if main_content:
                 return main_content
@@ -138,7 +358,7 @@ class WebsiteCrawler:
     def _clean_text(self, text: str) -> str:
         """Clean and normalize extracted text."""
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = ' '.join(text.split())
 
         # Remove very short lines (likely navigation or menus)
         lines = text.split('\n')
@@ -151,6 +371,9 @@ class WebsiteCrawler:
         text = ' '.join(cleaned_lines)
 
         # Remove excessive punctuation
-        text = re.sub(r'[^\w\s.,!?-]', '', text)
+        if text.isascii():
+            text = text.translate(_ASCII_PUNCT_TABLE)
+        else:
+            text = _PUNCT_RE.sub('', text)
 
         return text.strip()
@@ -1,16 +1,59 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import os
+import re
+import numpy as np
 import requests
+from utils import SemanticCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared session so Groq requests reuse keep-alive connections across engines
+_GROQ_SESSION = requests.Session()
+_GROQ_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+))
+
+# Words that make a question refer back to earlier turns of the conversation
+_FOLLOW_UP_RE = re.compile(
+    r"\b(?:it|its|they|them|their|this|that|these|those|he|him|his|she|her|"
+    r"one|ones|there|also|else|more|same|again|above|previous|earlier)\b",
+    re.IGNORECASE
+)
+
+# Words ignored when extracting key terms from a question
+_QUESTION_WORDS = frozenset({'what', 'is', 'are', 'the', 'a', 'an', 'how', 'why', 'when', 'where', 'who'})
+
+# Phrases that mark a definition-style question, matched anywhere in one scan
+_DEFINE_RE = re.compile('what is|what are|define|explain')
+
+class SemanticAnswerCache(SemanticCache):
+    """
+    Remembers answers by question embedding so that paraphrases of an earlier
+    question are answered without another retrieval and LLM round-trip. Only
+    answers to standalone questions belong here, since they don't depend on
+    the chat history sent along with the question.
+    """
+    def __init__(self, threshold: float = 0.92):
+        """
+        Args:
+            threshold: Minimum cosine similarity for a cached answer to be reused
+        """
+        super().__init__(threshold)
 
 class QAEngine:
-    def __init__(self, vector_store):
+    def __init__(self, vector_store, answer_cache: Optional[SemanticAnswerCache] = None):
         """
         Initialize QA engine with vector store using free alternatives.
 
         Args:
             vector_store: Chroma vector store instance
+            answer_cache: Optional cache shared across engines for the same store
         """
         self.vector_store = vector_store
+        self.answer_cache = answer_cache
+        self._http = _GROQ_SESSION
 
         # Try Groq API (free tier available)
         self.groq_api_key = os.getenv('GROQ_API_KEY', '')
@@ -31,8 +74,24 @@ class QAEngine:
             Answer based on website content
         """
         try:
+            # Embed the question once for both the answer cache and retrieval
+            question_vector = self._embed_question(question)
+            use_cache = (
+                question_vector is not None
+                and self.answer_cache is not None
+                and self._is_standalone(question, chat_history)
+            )
+
+            if use_cache:
+                cached_answer = self.answer_cache.lookup(question_vector)
+                if cached_answer is not None:
+                    return cached_answer
+
             # Retrieve relevant documents from vector store
-            docs = self.vector_store.similarity_search(question, k=5)
+            if question_vector is not None:
+                docs = self.vector_store.similarity_search_by_vector(question_vector.tolist(), k=5)
+            else:
+                docs = self.vector_store.similarity_search(question, k=5)
 
             if not docs:
                 return "The answer is not available on the provided website."
@@ -62,9 +121,10 @@ Do not use any external knowledge or make assumptions. Base your answer strictly
             messages.append({"role": "user", "content": f"Context from the website:\n{context}\n\nQuestion: {question}"})
 
             # Try Groq API first (free tier)
+            from_llm = False
             if self.use_groq:
                 try:
-                    groq_response = requests.post(
+                    groq_response = self._http.post(
                         "https://api.groq.com/openai/v1/chat/completions",
                         headers={
                             "Authorization": f"Bearer {self.groq_api_key}",
@@ -75,10 +135,12 @@ Do not use any external knowledge or make assumptions. Base your answer strictly
                             "messages": messages,
                             "temperature": 0.1,
                             "max_tokens": 500
-                        }
+                        },
+                        timeout=(3.05, 30)
                     )
                     if groq_response.status_code == 200:
                         answer = groq_response.json()["choices"][0]["message"]["content"].strip()
+                        from_llm = True
                     else:
                         raise Exception("Groq API failed")
                 except:
@@ -96,12 +158,46 @@ Do not use any external knowledge or make assumptions. Base your answer strictly
             if "the answer is not available on the provided website" in answer.lower():
                 return "The answer is not available on the provided website."
 
+            # Keyword answers are a degraded fallback (e.g. after a transient
+            # API error), so only LLM answers are worth reusing
+            if use_cache and from_llm:
+                self.answer_cache.add(question_vector, answer)
+
             return answer
 
         except Exception as e:
             # In case of any error, return the standard message
             return "The answer is not available on the provided website."
 
+    def _is_standalone(self, question: str, chat_history: Optional[List[Dict[str, str]]]) -> bool:
+        """
+        Whether the answer to a question is independent of the chat history:
+        either nothing was asked before it, or it doesn't refer back to
+        earlier turns.
+        """
+        earlier = list(chat_history or [])
+
+        # The app appends the current question to the history before asking it
+        if earlier and earlier[-1].get('role') == 'user' and earlier[-1].get('content') == question:
+            earlier.pop()
+
+        return not earlier or not _FOLLOW_UP_RE.search(question)
+
+    def _embed_question(self, question: str) -> Optional[np.ndarray]:
+        """
+        Embed the question with the vector store's embedding function.
+
+        Returns:
+            Unit-length float32 vector, or None if the store has no embedder
+        """
+        embeddings = getattr(self.vector_store, 'embeddings', None)
+        if embeddings is None:
+            return None
+
+        vector = np.asarray(embeddings.embed_query(question), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
     def _update_memory_from_history(self, chat_history: List[Dict[str, str]]):
         """
         Update conversation memory from chat history.
@@ -140,21 +236,14 @@ Do not use any external knowledge or make assumptions. Base your answer strictly
             Simple answer based on keyword matching
         """
         question_lower = question.lower()
-        context_lower = context.lower()
 
         # Basic keyword matching for common questions
-        if any(word in question_lower for word in ['what is', 'what are', 'define', 'explain']):
-            # Try to find relevant sentences containing key terms
-            sentences = context.split('.')
-            relevant_sentences = []
-
+        if _DEFINE_RE.search(question_lower):
             # Extract key terms from question (remove question words)
-            question_words = ['what', 'is', 'are', 'the', 'a', 'an', 'how', 'why', 'when', 'where', 'who']
-            key_terms = [word for word in question_lower.split() if word not in question_words and len(word) > 2]
+            key_terms = [word for word in question_lower.split() if word not in _QUESTION_WORDS and len(word) > 2]
 
-            for sentence in sentences:
-                if any(term in sentence.lower() for term in key_terms[:3]):  # Use top 3 key terms
-                    relevant_sentences.append(sentence.strip())
+            # Try to find relevant sentences containing key terms
+            relevant_sentences = self._find_sentences(context, key_terms[:3])  # Use top 3 key terms
 
             if relevant_sentences:
                 return '. '.join(relevant_sentences[:2]) + '.'  # Return up to 2 relevant sentences
@@ -165,13 +254,7 @@ Do not use any external knowledge or make assumptions. Base your answer strictly
 
         if content_words:
             # Find sentences containing these words
-            sentences = context.split('.')
-            matching_sentences = []
-
-            for sentence in sentences:
-                sentence_lower = sentence.lower()
-                if any(word in sentence_lower for word in content_words):
-                    matching_sentences.append(sentence.strip())
+            matching_sentences = self._find_sentences(context, content_words, limit=3)
 
             if matching_sentences:
                 return '. '.join(matching_sentences[:3]) + '.'  # Return up to 3 sentences
@@ -179,6 +262,47 @@ Do not use any external knowledge or make assumptions. Base your answer strictly
         # If no relevant content found
         return "The answer is not available on the provided website."
 
+    def _find_sentences(self, context: str, terms: List[str], limit: int = 2) -> List[str]:
+        """
+        Find the '.'-delimited sentences of the context that contain any of the terms.
+
+        All terms are matched in a single case-insensitive regex scan over the
+        context instead of lowercasing and searching every sentence separately.
+
+        Args:
+            context: Retrieved context from the website
+            terms: Lowercase terms to look for
+            limit: Maximum number of sentences to return
+
+        Returns:
+            Matching sentences in order of appearance
+        """
+        # A term containing '.' can never fall inside a single sentence
+        terms = [term for term in terms if '.' not in term]
+        if not terms:
+            return []
+
+        pattern = re.compile('|'.join(map(re.escape, terms)), re.IGNORECASE)
+
+        sentences = []
+        position = 0
+        while len(sentences) < limit:
+            match = pattern.search(context, position)
+            if match is None:
+                break
+
+            sentence_start = context.rfind('.', 0, match.start()) + 1
+            sentence_end = context.find('.', match.end())
+            if sentence_end == -1:
+                sentence_end = len(context)
+
+            sentences.append(context[sentence_start:sentence_end].strip())
+
+            # Resume after this sentence; later hits in it add nothing
+            position = sentence_end + 1
+
+        return sentences
+
     def clear_memory(self):
         """Clear conversation memory."""
         pass  # No memory to clear in free version
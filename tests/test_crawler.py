@@ -0,0 +1,108 @@
+import io
+
+import pytest
+import requests
+from bs4 import BeautifulSoup
+
+import crawler
+from crawler import WebsiteCrawler
+
+pytestmark = pytest.mark.skipif(crawler.etree is None, reason="lxml is not installed")
+
+PAGES = {
+    'basic': (
+        "<html><head><title>Basic page</title></head><body>"
+        "<nav>Home About Contact and other navigation links</nav>"
+        "<p>This paragraph is long enough to survive the cleaning step.</p>"
+        "<footer>Copyright notice that should never be extracted</footer>"
+        "</body></html>"
+    ).encode(),
+    'nomain': (
+        "<html><body><div><p>First paragraph of a page without a main area.</p>"
+        "<p>Second paragraph of a page without a main area.</p></div></body></html>"
+    ).encode(),
+    'unicode': (
+        "<html><head><meta charset='utf-8'><title>Café – menü</title></head><body>"
+        "<main><p>Crème brûlée, naïve façades and 東京 all decode correctly here.</p></main>"
+        "</body></html>"
+    ).encode('utf-8'),
+    'nested_main': (
+        "<html><body><div class='content'>Outer content area text that is long enough "
+        "<article>Article text nested inside the content area</article> trailing words</div>"
+        "</body></html>"
+    ).encode(),
+    'multiple_main': (
+        "<html><body><main>Main region text that is long enough to keep.</main>"
+        "<div class='content'>Content region text that must not be included.</div>"
+        "</body></html>"
+    ).encode(),
+    'emptymain': (
+        "<html><body><main>   </main>"
+        "<p>Body paragraph text used when the main area is empty.</p></body></html>"
+    ).encode(),
+    'skipped_main': (
+        "<html><body><aside><main>Main area hidden inside an aside element.</main></aside>"
+        "<div id='content'>Content found by id because the main area is skipped.</div>"
+        "</body></html>"
+    ).encode(),
+    'metacharset': (
+        "<html><head><meta http-equiv='Content-Type' content='text/html; charset=iso-8859-1'>"
+        "<title>Caf\xe9</title></head><body>"
+        "<p>Our caf\xe9 serves cr\xe8me br\xfbl\xe9e every single day.</p></body></html>"
+    ).encode('latin-1'),
+    'latin1_undeclared': (
+        "<html><head><title>Caf\xe9 menu</title></head><body>"
+        "<p>Our caf\xe9 serves cr\xe8me br\xfbl\xe9e every single day.</p></body></html>"
+    ).encode('latin-1'),
+    'utf8_undeclared': (
+        "<html><head><title>Café menu</title></head><body>"
+        "<p>Our café serves crème brûlée every single day.</p></body></html>"
+    ).encode('utf-8'),
+}
+
+class TrickleStream(io.BytesIO):
+    """Raw response body that hands out at most a few bytes per read."""
+    def read(self, size=-1):
+        return super().read(7)
+
+def make_response(body: bytes, content_type: str = 'text/html') -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = TrickleStream(body)
+    response.headers['Content-Type'] = content_type
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+def extract_with_soup(body: bytes, content_type: str = 'text/html'):
+    """Title and text as produced by the BeautifulSoup fallback in crawl()."""
+    crawler_instance = WebsiteCrawler()
+    soup = BeautifulSoup(
+        body, crawler.HTML_PARSER, parse_only=crawler.CONTENT_STRAINER,
+        from_encoding=crawler_instance._detect_encoding(make_response(body, content_type), body)
+    )
+    return crawler_instance._extract_title(soup), crawler_instance._extract_content(soup, 'https://example.com')
+
+@pytest.mark.parametrize('name', sorted(PAGES))
+def test_streaming_matches_soup(name):
+    body = PAGES[name]
+    streamed = WebsiteCrawler()._extract_streaming(make_response(body))
+    assert streamed == extract_with_soup(body)
+    assert streamed[1]
+
+@pytest.mark.parametrize('content_type', ['text/html; charset=utf-8', 'text/html; charset=iso-8859-1'])
+def test_streaming_matches_soup_with_declared_charset(content_type):
+    body = PAGES['unicode']
+    streamed = WebsiteCrawler()._extract_streaming(make_response(body, content_type))
+    assert streamed == extract_with_soup(body, content_type)
+
+def test_first_main_region_only():
+    _, text = WebsiteCrawler()._extract_streaming(make_response(PAGES['multiple_main']))
+    assert text == "Main region text that is long enough to keep."
+
+@pytest.mark.parametrize('name', ['latin1_undeclared', 'utf8_undeclared', 'metacharset'])
+def test_undeclared_encodings_decode(name):
+    _, text = WebsiteCrawler()._extract_streaming(make_response(PAGES[name]))
+    assert "crème brûlée" in text
+
+def test_empty_body():
+    assert WebsiteCrawler()._extract_streaming(make_response(b'')) == ("Untitled Page", "")
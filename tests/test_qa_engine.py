@@ -0,0 +1,119 @@
+import pytest
+import requests
+
+import qa_engine
+from qa_engine import QAEngine, SemanticAnswerCache
+
+CONTEXTS = [
+    "Our Pricing starts at ten dollars. Support is available all day. Pricing for teams differs",
+    "pricing pricing PRICING. Nothing here. Team plans include pricing support. Last one mentions support",
+    "No separators at all but the term support appears twice: support",
+    "...Leading dots. Pricing. . Support.",
+    "",
+]
+
+TERMS = [
+    ['pricing'],
+    ['support', 'pricing'],
+    ['team', 'plans', 'support'],
+    ['absent'],
+    ['e.g', 'support'],
+]
+
+def reference_sentences(context, terms, limit):
+    """The split-and-search loop _find_sentences replaced."""
+    matches = [s.strip() for s in context.split('.') if any(term in s.lower() for term in terms)]
+    return matches[:limit]
+
+@pytest.mark.parametrize('context', CONTEXTS)
+@pytest.mark.parametrize('terms', TERMS)
+@pytest.mark.parametrize('limit', [1, 2, 3])
+def test_find_sentences_matches_split_search(context, terms, limit):
+    engine = QAEngine(vector_store=None)
+    assert engine._find_sentences(context, terms, limit=limit) == reference_sentences(context, terms, limit)
+
+STOP_WORDS = {'what', 'is', 'the', 'a', 'how', 'much', 'does', 'it', 'about', 'tell', 'me'}
+VOCABULARY = ['pricing', 'cost', 'widget', 'gadget', 'support']
+
+class WordEmbeddings:
+    """Bag-of-words embedding over a tiny vocabulary; stop words are ignored."""
+    def embed_query(self, text):
+        words = {word.strip('?.,!').lower() for word in text.split()} - STOP_WORDS
+        return [1.0 if term in words else 0.0 for term in VOCABULARY] + [0.1]
+
+class Doc:
+    def __init__(self, page_content):
+        self.page_content = page_content
+
+class FakeStore:
+    embeddings = WordEmbeddings()
+
+    def similarity_search_by_vector(self, embedding, k=5):
+        return [Doc("Pricing starts at ten dollars. The widget costs ten dollars. The gadget costs twenty dollars.")]
+
+class FakeGroqResponse:
+    status_code = 200
+
+    def __init__(self, content):
+        self.content = content
+
+    def json(self):
+        return {"choices": [{"message": {"content": self.content}}]}
+
+class FakeGroq:
+    """Stands in for the Groq endpoint; counts calls and can be made to fail."""
+    def __init__(self):
+        self.calls = 0
+        self.failing = False
+
+    def post(self, *args, **kwargs):
+        self.calls += 1
+        if self.failing:
+            raise requests.ConnectionError("Groq is down")
+        return FakeGroqResponse(f"LLM answer {self.calls}")
+
+@pytest.fixture
+def groq(monkeypatch):
+    monkeypatch.setenv('GROQ_API_KEY', 'test-key')
+    fake = FakeGroq()
+    monkeypatch.setattr(qa_engine._GROQ_SESSION, 'post', fake.post)
+    return fake
+
+def ask(engine, history, question):
+    """Ask the way app.py does: the question is appended to the history first."""
+    history.append({"role": "user", "content": question})
+    answer = engine.ask_question(question, history)
+    history.append({"role": "assistant", "content": answer})
+    return answer
+
+def test_repeated_and_paraphrased_questions_skip_groq(groq):
+    engine = QAEngine(FakeStore(), SemanticAnswerCache())
+    history = []
+
+    first = ask(engine, history, "What is pricing?")
+    assert ask(engine, history, "What is pricing?") == first
+    assert ask(engine, history, "what is the pricing") == first
+    assert groq.calls == 1
+
+def test_follow_up_questions_are_not_reused(groq):
+    engine = QAEngine(FakeStore(), SemanticAnswerCache())
+    history = []
+
+    ask(engine, history, "Tell me about the widget")
+    widget_cost = ask(engine, history, "How much does it cost?")
+    ask(engine, history, "Tell me about the gadget")
+    gadget_cost = ask(engine, history, "How much does it cost?")
+
+    assert widget_cost != gadget_cost
+    assert groq.calls == 4
+
+def test_fallback_answers_are_not_cached(groq):
+    engine = QAEngine(FakeStore(), SemanticAnswerCache())
+
+    groq.failing = True
+    fallback = engine.ask_question("What is pricing")
+    assert "Pricing starts at ten dollars" in fallback
+
+    groq.failing = False
+    assert engine.ask_question("What is pricing") == "LLM answer 2"
+    assert groq.calls == 2
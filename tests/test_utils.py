@@ -0,0 +1,50 @@
+import numpy as np
+
+from utils import SemanticCache
+
+def unit(*components):
+    vector = np.asarray(components, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+def test_semantic_cache_reuses_values_above_threshold():
+    cache = SemanticCache(threshold=0.9)
+    assert cache.lookup(unit(1, 0, 0)) is None
+
+    cache.add(unit(1, 0, 0), 'x')
+    cache.add(unit(0, 1, 0), 'y')
+
+    assert cache.lookup(unit(1, 0.1, 0)) == 'x'
+    assert cache.lookup(unit(0.1, 1, 0)) == 'y'
+    assert cache.lookup(unit(1, 1, 0)) is None  # cosine 0.71 to both
+    assert cache.lookup(unit(0, 0, 1)) is None
+
+def test_semantic_cache_skips_rejected_entries():
+    cache = SemanticCache(threshold=0.9)
+    cache.add(unit(1, 0, 0), (5, 'closest'))
+    cache.add(unit(1, 0.2, 0), (10, 'further'))
+
+    query = unit(1, 0.05, 0)
+    assert cache.lookup(query) == (5, 'closest')
+    assert cache.lookup(query, accept=lambda entry: entry[0] >= 8) == (10, 'further')
+    assert cache.lookup(query, accept=lambda entry: entry[0] >= 20) is None
+
+def test_semantic_cache_grows_past_initial_capacity():
+    cache = SemanticCache(threshold=0.999)
+    vectors = [unit(np.cos(angle), np.sin(angle)) for angle in np.linspace(0, np.pi / 2, 40)]
+    for i, vector in enumerate(vectors):
+        cache.add(vector, i)
+
+    assert [cache.lookup(vector) for vector in vectors] == list(range(40))
+
+def test_semantic_cache_overwrites_oldest_entries_when_full():
+    cache = SemanticCache(threshold=0.99, max_entries=3)
+    axes = [unit(*row) for row in np.eye(4)]
+    for i, vector in enumerate(axes):
+        cache.add(vector, i)
+
+    assert cache.lookup(axes[0]) is None
+    assert [cache.lookup(vector) for vector in axes[1:]] == [1, 2, 3]
+
+    cache.add(unit(1, 1, 0, 0), 'new')
+    assert cache.lookup(axes[1]) is None
+    assert cache.lookup(unit(1, 1, 0, 0)) == 'new'
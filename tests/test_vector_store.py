@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("chromadb")
+pytest.importorskip("langchain_chroma")
+
+from langchain_core.documents import Document
+
+import vector_store
+from vector_store import CachedEmbedder, InMemoryVectorStore
+
+class CountingEmbedder:
+    """Embeds text as [len(text), 1.0] and records every batch it is asked for."""
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0]
+
+def test_cached_embedder_embeds_each_text_once(tmp_path):
+    inner = CountingEmbedder()
+    embedder = CachedEmbedder(inner, 'model', str(tmp_path / 'cache.sqlite3'))
+
+    assert embedder.embed_documents(['a', 'bb', 'a']) == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert embedder.embed_documents(['bb', 'ccc']) == [[2.0, 1.0], [3.0, 1.0]]
+    assert inner.calls == [['a', 'bb'], ['ccc']]
+
+def test_cached_embedder_persists_per_model(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    CachedEmbedder(CountingEmbedder(), 'model', path).embed_documents(['a', 'bb'])
+
+    same_model = CountingEmbedder()
+    assert CachedEmbedder(same_model, 'model', path).embed_documents(['bb', 'a']) == [[2.0, 1.0], [1.0, 1.0]]
+    assert same_model.calls == []
+
+    other_model = CountingEmbedder()
+    CachedEmbedder(other_model, 'other-model', path).embed_documents(['a'])
+    assert other_model.calls == [['a']]
+
+def test_cached_embedder_does_not_cache_queries(tmp_path):
+    inner = CountingEmbedder()
+    embedder = CachedEmbedder(inner, 'model', str(tmp_path / 'cache.sqlite3'))
+    assert embedder.embed_query('abc') == [3.0, 1.0]
+    assert inner.calls == []
+
+@pytest.mark.parametrize('hnsw_space', vector_store.HNSW_SPACES)
+@pytest.mark.parametrize('use_hnswlib', [True, False])
+def test_in_memory_store_ranks_by_dot_product(monkeypatch, use_hnswlib, hnsw_space):
+    if use_hnswlib:
+        pytest.importorskip("hnswlib")
+    else:
+        monkeypatch.setattr(vector_store, 'hnswlib', None)
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((500, 32)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    documents = [Document(page_content=str(i)) for i in range(len(vectors))]
+    store = InMemoryVectorStore(vector_store=None, vectors=vectors, documents=documents, hnsw_space=hnsw_space)
+
+    query = vectors[42] + 0.05
+    expected = np.argsort(-(vectors @ query))[:5]
+    assert store.similarity_search_by_vector(query.tolist(), k=5) == [documents[i] for i in expected]
+    assert len(store.similarity_search_by_vector(query.tolist(), k=1000)) == len(vectors)
+
+def test_in_memory_store_serves_a_saved_index(tmp_path):
+    hnswlib = pytest.importorskip("hnswlib")
+
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((300, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    documents = [Document(page_content=str(i)) for i in range(len(vectors))]
+    built = InMemoryVectorStore(vector_store=None, vectors=vectors, documents=documents)
+
+    path = str(tmp_path / 'index.bin')
+    assert built.save_index(path)
+    index = hnswlib.Index(space='ip', dim=16)
+    index.load_index(path)
+    loaded = InMemoryVectorStore(vector_store=None, vectors=None, documents=documents, index=index)
+
+    for query in vectors[:20] + 0.05:
+        assert loaded.similarity_search_by_vector(query.tolist(), k=5) == built.similarity_search_by_vector(query.tolist(), k=5)
+
+def test_in_memory_store_reuses_results_of_near_duplicate_queries(monkeypatch):
+    monkeypatch.setattr(vector_store, 'hnswlib', None)
+    vectors = np.eye(8, dtype=np.float32)
+    documents = [Document(page_content=str(i)) for i in range(8)]
+    store = InMemoryVectorStore(vector_store=None, vectors=vectors, documents=documents)
+
+    searches = []
+    search = store._search
+    monkeypatch.setattr(store, '_search', lambda query, k: searches.append(k) or search(query, k))
+
+    query = np.full(8, 0.1, dtype=np.float32)
+    query[3] = 1.0
+    first = store.similarity_search_by_vector(query.tolist(), k=2)
+    assert first[0] == documents[3]
+    assert store.similarity_search_by_vector((query * 2).tolist(), k=2) == first
+    assert store.similarity_search_by_vector(query.tolist(), k=1) == first[:1]
+    assert searches == [2]
+
+    # A wider request can't be served from a narrower cached result
+    assert len(store.similarity_search_by_vector(query.tolist(), k=4)) == 4
+    assert searches == [2, 4]
+
+@pytest.mark.parametrize("value, device, expected", [
+    (None, 'cuda', 128),
+    (None, 'mps', 64),
+    (None, 'cpu', 32),
+    ('16', 'cuda', 16),
+    (' 48 ', 'cpu', 48),
+    ('0', 'cpu', 32),
+    ('-8', 'mps', 64),
+    ('lots', 'cuda', 128),
+])
+def test_batch_size_override_falls_back_to_device_default(monkeypatch, value, device, expected):
+    if value is None:
+        monkeypatch.delenv('EMBEDDING_BATCH_SIZE', raising=False)
+    else:
+        monkeypatch.setenv('EMBEDDING_BATCH_SIZE', value)
+
+    assert vector_store.get_batch_size(device) == expected
@@ -3,6 +3,9 @@ from langchain_core.documents import Document
 from typing import List, Dict, Any
 import re
 
+# Precompiled pattern for _clean_text
+_SENTENCE_END_RE = re.compile(r'[.!?]$')
+
 class TextProcessor:
     def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
         """
@@ -14,6 +17,7 @@ class TextProcessor:
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self._splitter = self._create_splitter()
 
     def process_and_chunk(self, content_data: Dict[str, str], source_url: str) -> List[Document]:
         """
@@ -35,34 +39,20 @@ class TextProcessor:
         if not cleaned_text.strip():
             return []
 
-        # Create text splitter
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", ". ", " ", ""]
-        )
-
         # Split text into chunks
-        chunks = text_splitter.split_text(cleaned_text)
-
-        # Create Document objects with metadata
-        documents = []
-        for i, chunk in enumerate(chunks):
-            metadata = {
-                'source_url': source_url,
-                'page_title': content_data.get('title', 'Untitled Page'),
-                'chunk_index': i,
-                'total_chunks': len(chunks)
-            }
-
-            doc = Document(
-                page_content=chunk.strip(),
-                metadata=metadata
-            )
-            documents.append(doc)
-
-        return documents
+        chunks = self._splitter.split_text(cleaned_text)
+
+        # Create Document objects with metadata; chunks are already stripped by the splitter
+        base_metadata = {
+            'source_url': source_url,
+            'page_title': content_data.get('title', 'Untitled Page'),
+            'total_chunks': len(chunks)
+        }
+
+        return [
+            Document(page_content=chunk, metadata={**base_metadata, 'chunk_index': i})
+            for i, chunk in enumerate(chunks)
+        ]
 
     def _clean_text(self, text: str) -> str:
         """
@@ -77,11 +67,9 @@ class TextProcessor:
         if not text:
             return ""
 
-        # Remove extra whitespace and normalize
-        text = re.sub(r'\s+', ' ', text.strip())
-
-        # Remove excessive newlines
-        text = re.sub(r'\n\s*\n', '\n\n', text)
+        # Remove extra whitespace and normalize. This also collapses runs of
+        # newlines, so no separate blank-line pass is needed.
+        text = ' '.join(text.split())
 
         # Remove very short lines that might be artifacts
         lines = text.split('\n')
@@ -89,7 +77,7 @@ class TextProcessor:
         for line in lines:
             line = line.strip()
             # Keep lines that are either long enough or contain important punctuation
-            if len(line) >= 10 or re.search(r'[.!?]$', line):
+            if len(line) >= 10 or _SENTENCE_END_RE.search(line):
                 filtered_lines.append(line)
 
         text = '\n'.join(filtered_lines)
@@ -104,5 +92,19 @@ class TextProcessor:
             chunk_size: New chunk size
             chunk_overlap: New chunk overlap
         """
+        if chunk_size == self.chunk_size and chunk_overlap == self.chunk_overlap:
+            return
+
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self._splitter = self._create_splitter()
+
+    def _create_splitter(self) -> RecursiveCharacterTextSplitter:
+        """Create a text splitter for the current chunk configuration."""
+        return RecursiveCharacterTextSplitter(
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            length_function=len,
+            separators=["\n\n", "\n", ". ", " ", ""],
+            strip_whitespace=True
+        )
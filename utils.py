@@ -3,9 +3,11 @@ Utility functions for the website chatbot application.
 """
 
 import re
+import functools
 from urllib.parse import urlparse
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable
 import logging
+import numpy as np
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -79,18 +81,38 @@ def truncate_text(text: str, max_length: int = 200) -> str:
         return text
     return text[:max_length - 3] + "..."
 
-def count_tokens(text: str) -> int:
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
     """
-    Estimate token count for text (rough approximation).
+    Load the tiktoken encoding once; None if tiktoken or its data is unavailable.
+    """
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, falling back to approximate token counts: {e}")
+        return None
+
+@functools.lru_cache(maxsize=4096)
+def _count_encoded_tokens(text: str) -> int:
+    return len(_get_encoding().encode(text, disallowed_special=()))
+
+def count_tokens(text: str, fast: bool = False) -> int:
+    """
+    Count tokens in text using the cl100k_base tiktoken encoding.
 
     Args:
         text: Input text
+        fast: Return a rough approximation instead of tokenizing
 
     Returns:
-        Estimated token count
+        Token count
     """
-    # Rough approximation: 1 token ≈ 4 characters for English text
-    return len(text) // 4
+    if fast or _get_encoding() is None:
+        # Rough approximation: 1 token ≈ 4 characters for English text
+        return len(text) // 4
+
+    return _count_encoded_tokens(text)
 
 def clean_html_text(text: str) -> str:
     """
@@ -127,3 +149,60 @@ def extract_domain(url: str) -> Optional[str]:
         return parsed.netloc
     except:
         return None
+
+class SemanticCache:
+    """
+    Maps unit-length embedding vectors to cached values and returns the value
+    of the most similar stored vector when it is similar enough. Vectors live
+    in one preallocated float32 matrix; once max_entries is reached the oldest
+    entries are overwritten.
+    """
+    def __init__(self, threshold: float, max_entries: int = 512):
+        """
+        Args:
+            threshold: Minimum cosine similarity for a cached value to be reused
+            max_entries: Maximum number of cached vectors
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._vectors = None  # Preallocated (capacity, dim) float32 matrix
+        self._values = []
+        self._next = 0  # Slot overwritten next once the cache is full
+
+    def lookup(self, vector: np.ndarray, accept: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+        """
+        Return the value cached for the most similar vector that is close enough.
+
+        Args:
+            vector: Normalized query vector
+            accept: Optional predicate; entries above the threshold whose value
+                it rejects are skipped in favour of the next most similar one
+        """
+        if not self._values:
+            return None
+
+        similarities = self._vectors[:len(self._values)] @ vector
+        candidates = np.flatnonzero(similarities >= self.threshold)
+        for i in candidates[np.argsort(-similarities[candidates])]:
+            if accept is None or accept(self._values[i]):
+                return self._values[i]
+        return None
+
+    def add(self, vector: np.ndarray, value: Any):
+        """Cache a value for a (normalized) vector."""
+        size = len(self._values)
+        if size == self.max_entries:
+            self._vectors[self._next] = vector
+            self._values[self._next] = value
+            self._next = (self._next + 1) % self.max_entries
+            return
+
+        if self._vectors is None:
+            self._vectors = np.empty((min(16, self.max_entries), vector.shape[0]), dtype=np.float32)
+        elif size == self._vectors.shape[0]:
+            # Grow geometrically so appends stay amortized O(1)
+            capacity = min(2 * size, self.max_entries)
+            self._vectors = np.vstack([self._vectors, np.empty((capacity - size, vector.shape[0]), dtype=np.float32)])
+
+        self._vectors[size] = vector
+        self._values.append(value)
@@ -2,80 +2,536 @@ import chromadb
 from chromadb.config import Settings
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
-from typing import List, Optional
+from typing import List, Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
 import os
+import re
 import tempfile
 import shutil
+import hashlib
+import functools
+import logging
+import sqlite3
+import threading
+import uuid
+import zlib
 import numpy as np
+from urllib.parse import urlparse
+from utils import SemanticCache
+
+# chroma-hnswlib provides the hnswlib module; without it search falls back to a brute-force scan
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
+EMBEDDING_PRECISIONS = ('fp32', 'fp16', 'bf16')
+
+# Characters not allowed in a collection name
+_INVALID_CHARS = re.compile(r'[^a-zA-Z0-9.-]')
+
+# Dimensions kept by PCA, and the number of chunks needed before a fit is trusted
+PCA_COMPONENTS = 64
+PCA_MIN_DOCUMENTS = 2 * PCA_COMPONENTS
+
+# Distances the in-memory HNSW index can rank by
+HNSW_SPACES = ('ip', 'cosine', 'l2')
+
+# Number of chunks written to Chroma per add() call
+ADD_BATCH_SIZE = 512
 
 class SimpleEmbeddingFallback:
     """
     Simple fallback embedding class when sentence-transformers is not available.
     Uses basic TF-IDF style embeddings with LangChain interface.
     """
-    def __init__(self):
-        self.vocab = {}
-        self.vocab_size = 0
-
     def embed_documents(self, texts):
         """Embed multiple documents - required by LangChain."""
         return self._encode_texts(texts)
 
     def embed_query(self, text):
         """Embed a single query - required by LangChain."""
-        return self._encode_texts([text])[0]
+        # Runs on every question, so skip the batch matrix and its row indexing
+        embedding = self._encode_text(text)
+        norm = np.linalg.norm(embedding)
+        if norm > 0:
+            embedding /= norm
+        return embedding.tolist()
 
     def _encode_texts(self, texts):
         """Internal encoding method."""
-        embeddings = []
-        for text in texts:
-            # Simple word-based encoding
-            words = text.lower().split()
-            embedding = np.zeros(384)  # Standard embedding size
+        embeddings = np.zeros((len(texts), 384), dtype=np.float32)  # Standard embedding size
+
+        for row, text in enumerate(texts):
+            embeddings[row] = self._encode_text(text)
+
+        # Normalize
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True).clip(min=1e-12)
+
+        # Convert to lists for LangChain/Chroma in one pass over the whole matrix
+        return embeddings.tolist()
+
+    def _encode_text(self, text):
+        """Unnormalized embedding of a single text."""
+        # Simple word-based encoding
+        words = text.lower().split()
+        if not words:
+            return np.zeros(384, dtype=np.float32)
+
+        # Hashing trick: a stable hash picks each word's bucket, so no
+        # vocabulary has to be kept and vectors are the same in every process
+        word_idx = np.fromiter(
+            (zlib.crc32(word.encode()) % 384 for word in words),
+            dtype=np.int32,
+            count=len(words)
+        )
 
-            for i, word in enumerate(words):
-                if word not in self.vocab:
-                    self.vocab[word] = self.vocab_size
-                    self.vocab_size += 1
+        # Simple positional encoding, scatter-summed into the buckets
+        weights = 1.0 - np.arange(len(words)) / len(words)
+        return np.bincount(word_idx, weights=weights, minlength=384).astype(np.float32)
 
-                # Simple positional encoding
-                word_idx = self.vocab[word]
-                pos = i / max(len(words), 1)
-                embedding[word_idx % 384] += 1.0 * (1 - pos)
+def get_device() -> str:
+    """Return the torch device sentence-transformers should run on."""
+    import torch
+    if torch.cuda.is_available():
+        return 'cuda'
 
-            # Normalize
-            norm = np.linalg.norm(embedding)
-            if norm > 0:
-                embedding = embedding / norm
+    # torch.backends.mps only exists in torch >= 1.12
+    mps = getattr(torch.backends, 'mps', None)
+    if mps is not None and mps.is_available():
+        return 'mps'
 
-            embeddings.append(embedding.tolist())  # Convert to list for LangChain
+    return 'cpu'
 
-        return embeddings
+class SentenceTransformerEmbeddings:
+    """
+    LangChain-compatible wrapper around a SentenceTransformer model that
+    encodes all documents in a single batched call.
+    """
+    def __init__(self, model, batch_size: int = 64):
+        self.model = model
+        self.batch_size = batch_size
 
-class VectorStoreManager:
-    def __init__(self):
+    def embed_documents(self, texts):
+        """Embed multiple documents - required by LangChain."""
+        texts = list(texts)
+        if len(texts) > self.batch_size:
+            return self._encode_pipelined(texts).tolist()
+        return self._encode(texts).tolist()
+
+    def embed_query(self, text):
+        """Embed a single query - required by LangChain."""
+        return self._encode(text).tolist()
+
+    def _encode(self, texts) -> np.ndarray:
+        """Encode to normalized float32 vectors, whatever the model's precision."""
+        embeddings = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_tensor=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        # numpy has no bfloat16, so upcast on the torch side
+        return embeddings.float().cpu().numpy()
+
+    def _encode_pipelined(self, texts: List[str]) -> np.ndarray:
         """
-        Initialize vector store manager with free sentence-transformers embeddings.
+        Encode several batches, tokenizing the next batch in a worker thread
+        while the model runs the current one. Equivalent to _encode.
+        """
+        import torch
+
+        # Sort by length like encode() does, so each batch needs little padding
+        order = np.argsort([-len(text) for text in texts], kind='stable')
+        batches = [
+            [texts[i] for i in order[start:start + self.batch_size]]
+            for start in range(0, len(texts), self.batch_size)
+        ]
+
+        self.model.eval()
+        outputs = []
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            pending = pool.submit(self.model.tokenize, batches[0])
+            for i in range(len(batches)):
+                features = pending.result()
+                if i + 1 < len(batches):
+                    pending = pool.submit(self.model.tokenize, batches[i + 1])
+
+                features = {name: tensor.to(self.model.device) for name, tensor in features.items()}
+                with torch.no_grad():
+                    outputs.append(self.model(features)['sentence_embedding'].float())
+
+        embeddings = torch.nn.functional.normalize(torch.cat(outputs), p=2, dim=1).cpu().numpy()
+
+        # Restore the original order
+        result = np.empty_like(embeddings)
+        result[order] = embeddings
+        return result
+
+class CachedEmbedder:
+    """
+    Wraps a LangChain-style embedder and caches document vectors in SQLite,
+    keyed by a SHA-256 of the model name and chunk text, so unchanged chunks
+    are never embedded twice.
+    """
+    def __init__(self, embedder, model_name: str, cache_path: str):
+        self.embedder = embedder
+        self.model_name = model_name
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+
+    def embed_documents(self, texts):
+        """Embed multiple documents, only calling the model for cache misses."""
+        keys = [self._key(text) for text in texts]
+        vectors = self._lookup(keys)
+
+        # Deduplicate misses so repeated chunks are embedded once
+        uncached = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if uncached:
+            new_vectors = dict(zip(uncached, self.embedder.embed_documents(list(uncached.values()))))
+            self._store(new_vectors)
+            vectors.update(new_vectors)
+
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text):
+        """Embed a single query; queries are not cached."""
+        return self.embedder.embed_query(text)
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}|{text}".encode()).hexdigest()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Fetch cached vectors for the given keys."""
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for i in range(0, len(unique_keys), 500):
+                batch = unique_keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                    batch
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def _store(self, vectors: Dict[str, List[float]]):
+        """Write newly computed vectors to the cache."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in vectors.items()]
+            )
+            self._conn.commit()
+
+class PCAProjection:
+    """
+    PCA basis fitted on a collection's chunk embeddings. Projected vectors are
+    re-normalized so similarity scores stay comparable to the full vectors.
+    """
+    def __init__(self, mean: np.ndarray, components: np.ndarray):
+        self.mean = mean
+        self.components = components
+
+    @classmethod
+    def fit(cls, vectors: np.ndarray, n_components: int) -> 'PCAProjection':
+        """Fit the top principal components of the given vectors via SVD."""
+        mean = vectors.mean(axis=0)
+        _, _, vt = np.linalg.svd(vectors - mean, full_matrices=False)
+        return cls(mean.astype(np.float32), vt[:n_components].astype(np.float32))
+
+    @classmethod
+    def load(cls, path: str) -> 'PCAProjection':
+        data = np.load(path)
+        return cls(data['mean'], data['components'])
+
+    def save(self, path: str):
+        np.savez(path, mean=self.mean, components=self.components)
+
+    def transform(self, vectors: np.ndarray) -> np.ndarray:
+        projected = (np.asarray(vectors, dtype=np.float32) - self.mean) @ self.components.T
+        norms = np.linalg.norm(projected, axis=-1, keepdims=True)
+        return projected / np.maximum(norms, 1e-12)
+
+class ProjectedEmbeddings:
+    """
+    Applies a PCAProjection on top of another embedder, so documents and
+    queries end up in the same reduced space.
+    """
+    def __init__(self, embedder, projection: PCAProjection):
+        self.embedder = embedder
+        self.projection = projection
+
+    def embed_documents(self, texts):
+        """Embed multiple documents - required by LangChain."""
+        return self.projection.transform(self.embedder.embed_documents(texts)).tolist()
+
+    def embed_query(self, text):
+        """Embed a single query - required by LangChain."""
+        return self.projection.transform(self.embedder.embed_query(text)).tolist()
+
+class InMemoryVectorStore:
+    """
+    Searches a collection's (unit-length) embeddings in-process instead of
+    going through Chroma's query path, and returns the documents from memory.
+    With hnswlib available the vectors are served from an in-memory HNSW
+    index; otherwise the float32 vectors are scored brute-force with a single
+    BLAS matrix-vector product. Exposes the same search interface as the
+    Chroma store it wraps.
+    """
+    def __init__(
+        self,
+        vector_store: Chroma,
+        vectors,
+        documents: List[Document],
+        hnsw_space: str = 'ip',
+        hnsw_m: int = 32,
+        hnsw_construction_ef: int = 200,
+        hnsw_search_ef: int = 64,
+        index=None
+    ):
+        """
+        Args:
+            vector_store: Chroma store persisting the documents and vectors
+            vectors: Embeddings of the stored documents; unused when index is given
+            documents: The stored documents, in the same order as vectors
+            hnsw_space: Distance used by the HNSW index ('ip', 'cosine' or 'l2').
+                The brute-force fallback always ranks by inner product, which
+                orders unit-length vectors the same way as all three.
+            hnsw_m: Number of graph neighbours per HNSW node
+            hnsw_construction_ef: Candidate list size while building the index
+            hnsw_search_ef: Candidate list size while querying; higher trades speed for recall
+            index: A previously built hnswlib index over the documents, labelled
+                by position, e.g. one loaded with hnswlib's load_index()
         """
+        self.vector_store = vector_store
+        self.documents = list(documents)
+
+        self.index = index
+        if index is not None:
+            self.index.set_ef(hnsw_search_ef)
+        elif hnswlib is not None:
+            vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            self.index = hnswlib.Index(space=hnsw_space, dim=vectors.shape[1])
+            self.index.init_index(max_elements=len(vectors), ef_construction=hnsw_construction_ef, M=hnsw_m)
+            self.index.add_items(vectors, np.arange(len(vectors)))
+            self.index.set_ef(hnsw_search_ef)
+        else:
+            self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+
+        # Near-duplicate queries skip the search. The store may be shared
+        # between sessions, so the cache is locked.
+        self._semantic_cache = SemanticCache(threshold=0.97)
+        self._cache_lock = threading.Lock()
+
+    @property
+    def embeddings(self):
+        return self.vector_store.embeddings
+
+    def save_index(self, path: str) -> bool:
+        """Write the HNSW index to path. Returns False if there is no index to save."""
+        if self.index is None:
+            return False
+        self.index.save_index(path)
+        return True
+
+    def similarity_search(self, query: str, k: int = 5) -> List[Document]:
+        """Embed the query and return the k most similar documents."""
+        return self.similarity_search_by_vector(self.embeddings.embed_query(query), k=k)
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 5) -> List[Document]:
+        """Return the k documents whose embeddings have the highest dot product with embedding."""
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        unit_query = query / norm if norm > 0 else query
+
+        # Reuse results of a near-identical earlier query that asked for at least k documents
+        with self._cache_lock:
+            cached = self._semantic_cache.lookup(unit_query, accept=lambda entry: entry[0] >= k)
+        if cached is not None:
+            return list(cached[1][:k])
+
+        docs = self._search(query, k)
+
+        with self._cache_lock:
+            self._semantic_cache.add(unit_query, (k, docs))
+
+        return list(docs)
+
+    def _search(self, query: np.ndarray, k: int) -> List[Document]:
+        """Return the k documents with the highest dot product with query."""
+        k = min(k, len(self.documents))
+        if self.index is not None:
+            labels, _ = self.index.knn_query(query, k=k)
+            return [self.documents[i] for i in labels[0]]
+
+        # float32 matrix-vector product runs in BLAS; only the top k are sorted
+        scores = self.vectors @ query
+        top = np.argpartition(-scores, k - 1)[:k]
+        return [self.documents[i] for i in top[np.argsort(-scores[top])]]
+
+def get_batch_size(device: str) -> int:
+    """
+    Pick the encode batch size for a device.
+
+    Larger batches keep a GPU busy; on CPU they only add padding.
+    EMBEDDING_BATCH_SIZE overrides the default to fit the device's memory;
+    values that are not positive integers are ignored with a warning.
+    """
+    default = {'cuda': 128, 'mps': 64}.get(device, 32)
+    value = os.getenv('EMBEDDING_BATCH_SIZE', '').strip()
+    if not value:
+        return default
+    try:
+        batch_size = int(value)
+    except ValueError:
+        batch_size = 0
+    if batch_size <= 0:
+        logger.warning("Ignoring EMBEDDING_BATCH_SIZE=%r; using %d for %s", value, default, device)
+        return default
+    return batch_size
+
+@functools.lru_cache(maxsize=None)
+def get_embedder(precision: str = 'fp32'):
+    """
+    Load the embedding model once per process and share it between managers.
+
+    Args:
+        precision: 'fp32', 'fp16' (GPU only, CPU stays fp32) or 'bf16'
+    """
+    try:
+        # Try to import sentence_transformers directly
+        import torch
+        from sentence_transformers import SentenceTransformer
+        device = get_device()
+
+        model = SentenceTransformer(EMBEDDING_MODEL, device=device)
+        if precision == 'fp16' and device != 'cpu':
+            model.half()
+        elif precision == 'bf16':
+            model.to(torch.bfloat16)
+        else:
+            precision = 'fp32'
+
+        return CachedEmbedder(
+            SentenceTransformerEmbeddings(model, batch_size=get_batch_size(device)),
+            # Reduced-precision vectors differ slightly, so cache them separately
+            EMBEDDING_MODEL if precision == 'fp32' else f"{EMBEDDING_MODEL}@{precision}",
+            os.path.join(tempfile.gettempdir(), "website_chatbot_embeddings.sqlite3")
+        )
+    except ImportError:
+        # Fallback: create a simple mock embedding class. It is cheaper to
+        # recompute than to look up in the on-disk cache.
+        return SimpleEmbeddingFallback()
+
+# Open ChromaDB clients by persistence directory
+_CHROMA_CLIENTS = {}
+_CHROMA_CLIENTS_LOCK = threading.Lock()
+
+def get_chroma_client(path: str):
+    """Open one ChromaDB client per persistence directory."""
+    with _CHROMA_CLIENTS_LOCK:
+        client = _CHROMA_CLIENTS.get(path)
+        if client is None:
+            client = _CHROMA_CLIENTS[path] = chromadb.PersistentClient(
+                path=path,
+                settings=Settings(anonymized_telemetry=False)
+            )
+        return client
+
+def reset_chroma_client(path: str):
+    """
+    Close the client of one persistence directory so the next
+    get_chroma_client() call opens the path afresh. Clients of other
+    directories are left alone.
+    """
+    with _CHROMA_CLIENTS_LOCK:
+        client = _CHROMA_CLIENTS.pop(path, None)
+    if client is None:
+        return
+
+    # Clients of the same path share one system; drop and stop just that one
+    # so a new client doesn't reuse it and old handles fail instead of writing
+    try:
         try:
-            # Try to import sentence_transformers directly
-            from sentence_transformers import SentenceTransformer
-            self.embeddings = SentenceTransformer('sentence-transformers/all-MiniLM-L6-v2')
+            from chromadb.api.shared_system_client import SharedSystemClient
         except ImportError:
-            # Fallback: create a simple mock embedding class
-            self.embeddings = SimpleEmbeddingFallback()
+            from chromadb.api.client import SharedSystemClient
+        identifier = SharedSystemClient._get_identifier_from_settings(client.get_settings())
+        systems = getattr(SharedSystemClient, '_identifier_to_system', None)
+        if systems is None:
+            systems = SharedSystemClient._identifer_to_system  # Spelling used by chromadb < 0.6
+        system = systems.pop(identifier, None)
+        if system is not None:
+            system.stop()
+    except (ImportError, AttributeError):
+        pass  # Older chromadb versions don't share systems between clients
+
+class VectorStoreManager:
+    def __init__(
+        self,
+        precision: str = 'fp32',
+        hnsw_space: str = 'ip',
+        hnsw_m: int = 32,
+        hnsw_construction_ef: int = 200,
+        hnsw_search_ef: int = 64
+    ):
+        """
+        Initialize vector store manager with free sentence-transformers embeddings.
+
+        Args:
+            precision: Model precision - 'fp32', 'fp16' or 'bf16'. Half
+                precision roughly doubles throughput on supporting hardware.
+            hnsw_space: Distance used by the in-memory HNSW index ('ip', 'cosine'
+                or 'l2'). Stored and query vectors are unit length, so all three
+                rank alike; inner product skips computing norms.
+            hnsw_m: Number of graph neighbours per HNSW node
+            hnsw_construction_ef: Candidate list size while building the index
+            hnsw_search_ef: Candidate list size while querying; higher trades speed for recall
+        """
+        if precision not in EMBEDDING_PRECISIONS:
+            raise ValueError(f"Unsupported embedding precision: {precision}")
+        if hnsw_space not in HNSW_SPACES:
+            raise ValueError(f"Unsupported HNSW space: {hnsw_space}")
+
+        self.embeddings = get_embedder(precision)
+
+        # HNSW settings of the in-memory index that serves queries. Chroma's
+        # own index is never searched, so collections keep Chroma's defaults.
+        self.hnsw_settings = {
+            "hnsw_space": hnsw_space,
+            "hnsw_m": hnsw_m,
+            "hnsw_construction_ef": hnsw_construction_ef,
+            "hnsw_search_ef": hnsw_search_ef
+        }
 
         # Use a temporary directory for ChromaDB persistence
         self.persist_directory = os.path.join(tempfile.gettempdir(), "website_chatbot_chroma")
         os.makedirs(self.persist_directory, exist_ok=True)
 
-        # Initialize ChromaDB client
-        self.chroma_client = chromadb.PersistentClient(
-            path=self.persist_directory,
-            settings=Settings(anonymized_telemetry=False)
-        )
+        # Stores already opened by load_store/create_store, by collection name
+        self._store_cache: Dict[str, InMemoryVectorStore] = {}
+        self._store_lock = threading.Lock()
+
+    @property
+    def chroma_client(self):
+        """
+        The ChromaDB client of the persistence directory. It is looked up on
+        every use, so a client reopened by clear_all_stores() on any manager
+        is picked up by all of them.
+        """
+        return get_chroma_client(self.persist_directory)
 
-    def create_store(self, documents: List[Document]) -> Chroma:
+    def create_store(self, documents: List[Document]) -> InMemoryVectorStore:
         """
         Create a vector store from documents.
 
@@ -83,7 +539,7 @@ class VectorStoreManager:
             documents: List of Document objects with text chunks and metadata
 
         Returns:
-            Chroma vector store instance
+            In-memory vector store backed by a Chroma collection
         """
         if not documents:
             raise ValueError("No documents provided for vector store creation")
@@ -92,18 +548,62 @@ class VectorStoreManager:
         source_url = documents[0].metadata.get('source_url', 'unknown')
         collection_name = self._generate_collection_name(source_url)
 
+        # Embed every chunk in one batched call
+        texts = [doc.page_content for doc in documents]
+        vectors = self.embeddings.embed_documents(texts)
+
+        # Compress to PCA_COMPONENTS dims once there are enough chunks for a
+        # stable fit, and persist the basis so queries after a restart match
+        embedding = self.embeddings
+        projection_path = self._projection_path(collection_name)
+        if len(vectors) >= PCA_MIN_DOCUMENTS:
+            projection = PCAProjection.fit(np.asarray(vectors, dtype=np.float32), PCA_COMPONENTS)
+            projection.save(projection_path)
+            embedding = ProjectedEmbeddings(self.embeddings, projection)
+            vectors = projection.transform(vectors).tolist()
+        elif os.path.exists(projection_path):
+            os.remove(projection_path)
+
+        # Re-indexing replaces the collection; its dimensionality may change
+        try:
+            self.chroma_client.delete_collection(collection_name)
+        except Exception:
+            pass  # Collection did not exist yet
+
         # Create vector store
-        vector_store = Chroma.from_documents(
-            documents=documents,
-            embedding=self.embeddings,
+        vector_store = Chroma(
             client=self.chroma_client,
             collection_name=collection_name,
-            persist_directory=self.persist_directory
+            embedding_function=embedding
         )
+        # Write in slices so no single add() exceeds Chroma's maximum batch
+        # size or has to be serialized in one piece. Positional ids tie each
+        # chunk to its label in the persisted HNSW index.
+        ids = [str(i) for i in range(len(documents))]
+        for start in range(0, len(documents), ADD_BATCH_SIZE):
+            end = start + ADD_BATCH_SIZE
+            vector_store._collection.add(
+                ids=ids[start:end],
+                embeddings=vectors[start:end],
+                documents=texts[start:end],
+                metadatas=[doc.metadata for doc in documents[start:end]]
+            )
+
+        store = InMemoryVectorStore(vector_store, vectors, documents, **self.hnsw_settings)
+
+        # Persist the HNSW graph so reopening the collection doesn't rebuild it
+        for space in HNSW_SPACES:
+            stale_path = self._index_path(collection_name, space)
+            if os.path.exists(stale_path):
+                os.remove(stale_path)
+        store.save_index(self._index_path(collection_name))
 
-        return vector_store
+        with self._store_lock:
+            self._store_cache[collection_name] = store
 
-    def load_store(self, collection_name: str) -> Optional[Chroma]:
+        return store
+
+    def load_store(self, collection_name: str) -> Optional[InMemoryVectorStore]:
         """
         Load an existing vector store.
 
@@ -111,25 +611,79 @@ class VectorStoreManager:
             collection_name: Name of the collection to load
 
         Returns:
-            Chroma vector store instance or None if not found
+            In-memory vector store instance or None if not found
         """
+        with self._store_lock:
+            store = self._store_cache.get(collection_name)
+            if store is None:
+                store = self._open_store(collection_name)
+                if store is not None:
+                    self._store_cache[collection_name] = store
+            return store
+
+    def _open_store(self, collection_name: str) -> Optional[InMemoryVectorStore]:
+        """Open a persisted collection and build its in-memory search copy."""
         try:
+            # Queries must go through the same PCA basis as the stored chunks
+            embedding = self.embeddings
+            projection_path = self._projection_path(collection_name)
+            if os.path.exists(projection_path):
+                embedding = ProjectedEmbeddings(self.embeddings, PCAProjection.load(projection_path))
+
             vector_store = Chroma(
                 client=self.chroma_client,
                 collection_name=collection_name,
-                embedding_function=self.embeddings,
-                persist_directory=self.persist_directory
+                embedding_function=embedding
             )
-            return vector_store
+
+            # With a persisted index the embeddings needn't be read back
+            index = self._load_index(collection_name, vector_store._collection)
+            if index is not None:
+                stored = vector_store._collection.get(include=['documents', 'metadatas'])
+                documents = [None] * len(stored['ids'])
+                for chunk_id, text, metadata in zip(stored['ids'], stored['documents'], stored['metadatas']):
+                    documents[int(chunk_id)] = Document(page_content=text, metadata=metadata or {})
+                return InMemoryVectorStore(vector_store, None, documents, index=index, **self.hnsw_settings)
+
+            stored = vector_store._collection.get(include=['embeddings', 'documents', 'metadatas'])
+            if not stored['ids']:
+                return None
+
+            documents = [
+                Document(page_content=text, metadata=metadata or {})
+                for text, metadata in zip(stored['documents'], stored['metadatas'])
+            ]
+            return InMemoryVectorStore(vector_store, stored['embeddings'], documents, **self.hnsw_settings)
         except Exception:
             return None
 
-    def similarity_search(self, vector_store: Chroma, query: str, k: int = 5) -> List[Document]:
+    def _load_index(self, collection_name: str, collection):
+        """
+        Load the collection's persisted HNSW index, or return None if there is
+        none or it no longer matches the collection.
+        """
+        path = self._index_path(collection_name)
+        if hnswlib is None or not os.path.exists(path):
+            return None
+
+        try:
+            # hnswlib needs the dimension up front; one stored vector gives it
+            sample = collection.get(limit=1, include=['embeddings'])['embeddings']
+            index = hnswlib.Index(space=self.hnsw_settings['hnsw_space'], dim=len(sample[0]))
+            index.load_index(path)
+        except Exception:
+            return None  # Unreadable index; rebuild it from the stored vectors
+
+        if index.get_current_count() != collection.count():
+            return None
+        return index
+
+    def similarity_search(self, vector_store: InMemoryVectorStore, query: str, k: int = 5) -> List[Document]:
         """
         Perform similarity search on the vector store.
 
         Args:
-            vector_store: Chroma vector store instance
+            vector_store: Vector store instance
             query: Search query
             k: Number of results to return
 
@@ -138,9 +692,19 @@ class VectorStoreManager:
         """
         return vector_store.similarity_search(query, k=k)
 
+    def _projection_path(self, collection_name: str) -> str:
+        """Path of the persisted PCA basis for a collection."""
+        return os.path.join(self.persist_directory, f"{collection_name}.pca.npz")
+
+    def _index_path(self, collection_name: str, space: Optional[str] = None) -> str:
+        """Path of the persisted HNSW index for a collection, per distance space."""
+        space = space or self.hnsw_settings['hnsw_space']
+        return os.path.join(self.persist_directory, f"{collection_name}.{space}.hnsw.bin")
+
     def _generate_collection_name(self, source_url: str) -> str:
         """
-        Generate a unique collection name from source URL.
+        Generate a unique collection name from source URL: the cleaned domain
+        followed by a short blake2b digest of the full URL.
 
         Args:
             source_url: Source URL
@@ -148,9 +712,6 @@ class VectorStoreManager:
         Returns:
             Collection name safe for ChromaDB (only alphanumeric, dots, hyphens)
         """
-        from urllib.parse import urlparse
-        import re
-
         parsed = urlparse(source_url)
         domain = parsed.netloc
 
@@ -159,26 +720,47 @@ class VectorStoreManager:
             domain = domain[4:]
 
         # Replace invalid characters with hyphens
-        domain = re.sub(r'[^a-zA-Z0-9.-]', '-', domain)
+        domain = _INVALID_CHARS.sub('-', domain)
 
-        # Ensure it starts and ends with alphanumeric
-        domain = re.sub(r'^[^a-zA-Z0-9]+', '', domain)
-        domain = re.sub(r'[^a-zA-Z0-9]+$', '', domain)
+        # Ensure it starts and ends with alphanumeric; only '.' and '-' are left to strip
+        domain = domain.strip('.-')
 
         # Ensure minimum length and valid format
         if len(domain) < 3:
             domain = f"site-{domain or 'default'}"
 
-        # Limit length
-        return domain[:50]
+        # Keep a readable prefix and add a hash of the full URL, so URLs whose
+        # domains normalize to the same name never share a collection
+        suffix = hashlib.blake2b(source_url.encode(), digest_size=8).hexdigest()
+        return f"{domain[:40]}-{suffix}"
 
     def clear_all_stores(self):
         """
         Clear all stored vector stores (for cleanup).
+
+        Every manager shares the persistence directory, so this clears their
+        collections too. Their next Chroma call opens the fresh directory,
+        but stores they already opened keep serving their in-memory copy
+        until they are dropped.
         """
+        with self._store_lock:
+            self._store_cache.clear()
+
         try:
             if os.path.exists(self.persist_directory):
-                shutil.rmtree(self.persist_directory)
-                os.makedirs(self.persist_directory, exist_ok=True)
+                # Swap in an empty directory right away and delete the old one
+                # in the background, so the caller doesn't wait on rmtree
+                stale_directory = f"{self.persist_directory}.old-{uuid.uuid4().hex}"
+                os.rename(self.persist_directory, stale_directory)
+                threading.Thread(
+                    target=shutil.rmtree,
+                    args=(stale_directory,),
+                    kwargs={'ignore_errors': True},
+                    daemon=True
+                ).start()
+            os.makedirs(self.persist_directory, exist_ok=True)
+
+            # The open client still holds the moved files, so reopen this path only
+            reset_chroma_client(self.persist_directory)
         except Exception:
             pass  # Ignore cleanup errors